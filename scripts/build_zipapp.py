@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Build a single-file ticmd.pyz zipapp for fast CLI cold starts.
+
+Stages the package, precompiles it to optimized bytecode (-O) so the
+interpreter skips the source-vs-bytecode timestamp check and debug
+overhead on every import, then packs it with zipapp. Dependencies
+(click, libtmux) must still be importable from the target interpreter.
+
+Usage:
+    python scripts/build_zipapp.py [output.pyz]
+"""
+import compileall
+import pathlib
+import shutil
+import sys
+import tempfile
+import zipapp
+
+
+def main() -> int:
+    root = pathlib.Path(__file__).resolve().parent.parent
+    out = pathlib.Path(sys.argv[1]) if len(sys.argv) > 1 else root / 'ticmd.pyz'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        staged = pathlib.Path(tmp) / 'app'
+        shutil.copytree(root / 'src' / 'tmux_iterm_command',
+                        staged / 'tmux_iterm_command',
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        # legacy=True writes foo.pyc next to foo.py — the only layout
+        # zipimport actually loads; __pycache__ inside an archive is ignored.
+        # optimize=1 strips asserts but keeps docstrings, which click needs
+        # for the group description and docstring-derived command help.
+        compileall.compile_dir(str(staged), optimize=1, quiet=1, legacy=True)
+        zipapp.create_archive(staged, out,
+                              main='tmux_iterm_command.cli:run',
+                              interpreter='/usr/bin/env python3',
+                              compressed=True)
+
+    print(f"Built {out}")
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -1,57 +1,73 @@
 """Main CLI entry point for tmux-iterm-command."""
-import click
+import importlib
 import sys
-from typing import Optional
+from typing import List
+
+import click
+
+# Map CLI command names to (module, attribute) pairs so the command
+# handlers (and libtmux, which they import transitively) are only loaded
+# when a command is actually invoked. `--help`, `--version` and argument
+# errors stay at interpreter + click cost.
+LAZY_SUBCOMMANDS = {
+    'create-window': ('tmux_iterm_command.commands', 'create_window'),
+    'create-pane': ('tmux_iterm_command.commands', 'create_pane'),
+    'list-sessions': ('tmux_iterm_command.commands', 'list_sessions'),
+    'list-windows': ('tmux_iterm_command.commands', 'list_windows'),
+    'list-panes': ('tmux_iterm_command.commands', 'list_panes'),
+    'send': ('tmux_iterm_command.commands', 'send_command'),
+    'capture-pane': ('tmux_iterm_command.commands', 'capture_pane'),
+    'wait-idle': ('tmux_iterm_command.commands', 'wait_idle'),
+    'kill-window': ('tmux_iterm_command.commands', 'kill_window'),
+    'kill-pane': ('tmux_iterm_command.commands', 'kill_pane'),
+    'set-badge': ('tmux_iterm_command.commands', 'set_badge'),
+    'set-mark': ('tmux_iterm_command.commands', 'set_mark'),
+    'notify': ('tmux_iterm_command.commands', 'notify'),
+    'set-tab-color': ('tmux_iterm_command.commands', 'set_tab_color'),
+    'detect': ('tmux_iterm_command.commands', 'detect'),
+    'status': ('tmux_iterm_command.commands', 'status'),
+}
+
+
+class LazyGroup(click.Group):
+    """Click group that defers subcommand imports until invocation.
 
-from .manager import TmuxManager
-from .commands import (
-    create_window,
-    create_pane,
-    list_sessions,
-    list_windows,
-    list_panes,
-    send_command,
-    capture_pane,
-    wait_idle,
-    kill_window,
-    kill_pane,
-    set_badge,
-    set_mark,
-    notify,
-    set_tab_color,
-    detect,
-    status
-)
+    Subcommands are declared as a ``name -> (module, attribute)`` mapping;
+    the module is imported on first lookup and the resolved command is
+    cached, since click asks for a command more than once per invocation.
+    """
 
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = dict(lazy_subcommands or {})
+        self._resolved = {}
 
-@click.group()
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: click.Context, cmd_name: str):
+        target = self.lazy_subcommands.get(cmd_name)
+        if target is not None:
+            command = self._resolved.get(cmd_name)
+            if command is None:
+                module_name, attr = target
+                command = getattr(importlib.import_module(module_name), attr)
+                self._resolved[cmd_name] = command
+            return command
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(cls=LazyGroup, lazy_subcommands=LAZY_SUBCOMMANDS)
 @click.version_option(version="0.1.0")
 @click.option('--verbose/--no-verbose', default=False, help='Enable verbose output')
+@click.option('--minimal', is_flag=True, default=False,
+              help='Collapse successful results to {"ok": 1}')
 @click.pass_context
-def main(ctx: click.Context, verbose: bool):
+def main(ctx: click.Context, verbose: bool, minimal: bool):
     """Tmux and iTerm2 command tool for coding agents."""
     ctx.ensure_object(dict)
     ctx.obj['VERBOSE'] = verbose
-    ctx.obj['MANAGER'] = TmuxManager(verbose=verbose)
-
-
-# Add all commands to the CLI
-main.add_command(create_window)
-main.add_command(create_pane)
-main.add_command(list_sessions)
-main.add_command(list_windows)
-main.add_command(list_panes)
-main.add_command(send_command)
-main.add_command(capture_pane)
-main.add_command(wait_idle)
-main.add_command(kill_window)
-main.add_command(kill_pane)
-main.add_command(set_badge)
-main.add_command(set_mark)
-main.add_command(notify)
-main.add_command(set_tab_color)
-main.add_command(detect)
-main.add_command(status)
+    ctx.obj['MINIMAL'] = minimal
 
 
 def run():
@@ -67,4 +83,4 @@ def run():
 
 
 if __name__ == '__main__':
-    run()
\ No newline at end of file
+    run()
@@ -1,125 +1,192 @@
 """Command handlers for tmux-iterm-command CLI."""
 import click
+import functools
 import json
+import os
+import sys
 from typing import Dict, Any, Optional
 
-from .manager import TmuxManager
+try:
+    import orjson
+    # OPT_APPEND_NEWLINE (orjson >= 3.5) tacks the trailing newline on
+    # during serialization so the whole message is one buffer
+    _ORJSON_OPTS = getattr(orjson, 'OPT_APPEND_NEWLINE', 0)
+except ImportError:
+    orjson = None
+    _ORJSON_OPTS = 0
 
 
 def output_result(result: Dict[str, Any]) -> None:
     """Output the result in JSON format."""
-    print(json.dumps(result))
+    if orjson is not None:
+        # orjson serializes straight to UTF-8 bytes in C; emit message plus
+        # newline as a single buffered write so each result costs one
+        # syscall instead of print()'s two codec-encoded writes.
+        buf = orjson.dumps(result, option=_ORJSON_OPTS)
+        if not _ORJSON_OPTS:
+            buf += b'\n'
+        sys.stdout.buffer.write(buf)
+        sys.stdout.buffer.flush()
+    else:
+        sys.stdout.write(json.dumps(result) + '\n')
+
+
+@functools.lru_cache(maxsize=1)
+def _shell_integration_present() -> bool:
+    """Probe for iTerm2 shell integration scripts, once per process."""
+    home = os.path.expanduser('~')
+    return (os.path.exists(f'{home}/.iterm2_shell_integration.bash')
+            or os.path.exists(f'{home}/.iterm2_shell_integration.zsh'))
+
+
+def get_manager(ctx):
+    """Construct the TmuxManager for this invocation, caching it on ctx.
+
+    Imported and built here (not in `main`) so commands that never touch
+    tmux — detect, the iTerm2 placeholders, `--help` — skip the libtmux
+    import and the tmux session lookup entirely. The instance is stored
+    in ctx.obj so repeated lookups within one invocation share it.
+    """
+    manager = ctx.obj.get('MANAGER')
+    if manager is None:
+        from .manager import TmuxManager
+        manager = ctx.obj['MANAGER'] = TmuxManager(verbose=ctx.obj.get('VERBOSE', False))
+    return manager
+
+
+_MINIMAL_OK = {"ok": 1}
+
+# Methods whose success result only echoes the caller's inputs back, so
+# collapsing it loses nothing. Captures, listings and the create methods
+# (which return generated window/pane ids) always keep their payload.
+_ACK_ONLY_METHODS = frozenset({'send_command', 'kill_window', 'kill_pane'})
 
 
 def _execute_manager_command(ctx, method_name: str, **kwargs) -> None:
-    """Execute a manager method and output the result."""
-    manager: TmuxManager = ctx.obj['MANAGER']
+    """Execute a manager method and output the result.
+
+    With --minimal, successful ack-style results collapse to {"ok": 1} —
+    agents issuing thousands of commands usually only care that each one
+    succeeded, and the short form saves serialization and pipe bytes.
+    Data-bearing results and errors keep their full payload either way.
+    """
+    manager = get_manager(ctx)
     method = getattr(manager, method_name)
     result = method(**kwargs)
+    if (ctx.obj.get('MINIMAL') and method_name in _ACK_ONLY_METHODS
+            and result.get('status') == 'success'):
+        result = _MINIMAL_OK
     output_result(result)
 
 
 
-@click.command()
-@click.option('--name', required=True, help='Window name')
-@click.option('--command', help='Command to run in the window')
-@click.option('--shell', default='/bin/bash', help='Shell to use in the window')
-@click.pass_context
-def create_window(ctx: click.Context, name: str, command: Optional[str], shell: str) -> None:
-    """Create a new tmux window."""
-    _execute_manager_command(ctx, 'create_window', window_name=name, command=command, shell=shell)
-
-
-@click.command()
-@click.option('--window', 'window_index', type=int, required=True, help='Window index')
-@click.option('--vertical/--horizontal', default=True, help='Split orientation')
-@click.option('--command', help='Command to run in the new pane')
-@click.pass_context
-def create_pane(ctx: click.Context, window_index: int, vertical: bool, command: Optional[str]) -> None:
-    """Split a window to create a new pane."""
-    _execute_manager_command(ctx, 'create_pane', window_index=window_index, vertical=vertical, command=command)
-
-
-@click.command()
-@click.pass_context
-def list_sessions(ctx: click.Context) -> None:
-    """List all tmux sessions."""
-    _execute_manager_command(ctx, 'list_sessions')
-
-
-@click.command()
-@click.option('--session', help='Session name to list windows from')
-@click.pass_context
-def list_windows(ctx: click.Context, session: Optional[str]) -> None:
-    """List all windows in a session."""
-    _execute_manager_command(ctx, 'list_windows', session_name=session)
-
-
-@click.command()
-@click.option('--window', 'window_index', type=int, required=True, help='Window index')
-@click.pass_context
-def list_panes(ctx: click.Context, window_index: int) -> None:
-    """List all panes in a window."""
-    _execute_manager_command(ctx, 'list_panes', window_index=window_index)
-
-
-@click.command()
-@click.option('--window', 'window_index', type=int, required=True, help='Window index')
-@click.option('--pane', 'pane_index', type=int, required=True, help='Pane index')
-@click.argument('command')
-@click.option('--no-enter', is_flag=True, help='Do not send Enter after command')
-@click.pass_context
-def send_command(ctx: click.Context, window_index: int, pane_index: int, command: str, no_enter: bool) -> None:
-    """Send a command to a pane."""
-    _execute_manager_command(ctx, 'send_command',
-                            window_index=window_index,
-                            pane_index=pane_index,
-                            command=command,
-                            enter=not no_enter)
-
-
-@click.command()
-@click.option('--window', 'window_index', type=int, required=True, help='Window index')
-@click.option('--pane', 'pane_index', type=int, required=True, help='Pane index')
-@click.option('--lines', default=100, help='Number of lines to capture')
-@click.pass_context
-def capture_pane(ctx: click.Context, window_index: int, pane_index: int, lines: int) -> None:
-    """Capture output from a pane."""
-    _execute_manager_command(ctx, 'capture_pane', window_index=window_index, pane_index=pane_index, lines=lines)
-
-
-@click.command()
-@click.option('--window', 'window_index', type=int, required=True, help='Window index')
-@click.option('--pane', 'pane_index', type=int, required=True, help='Pane index')
-@click.option('--timeout', default=30, help='Timeout in seconds')
-@click.option('--quiet-for', 'quiet_for', default=2, help='Seconds of no output to consider idle')
-@click.option('--poll-interval', 'poll_interval', default=0.1, help='Polling interval in seconds')
-@click.pass_context
-def wait_idle(ctx: click.Context, window_index: int, pane_index: int, timeout: int, quiet_for: int, poll_interval: float) -> None:
-    """Wait for a pane to be idle."""
-    _execute_manager_command(ctx, 'wait_idle',
-                            window_index=window_index,
-                            pane_index=pane_index,
-                            timeout=timeout,
-                            quiet_for=quiet_for,
-                            poll_interval=poll_interval)
-
-
-@click.command()
-@click.option('--window', 'window_index', type=int, required=True, help='Window index to kill')
-@click.pass_context
-def kill_window(ctx: click.Context, window_index: int) -> None:
-    """Kill a tmux window."""
-    _execute_manager_command(ctx, 'kill_window', window_index=window_index)
-
-
-@click.command()
-@click.option('--window', 'window_index', type=int, required=True, help='Window index')
-@click.option('--pane', 'pane_index', type=int, required=True, help='Pane index to kill')
-@click.pass_context
-def kill_pane(ctx: click.Context, window_index: int, pane_index: int) -> None:
-    """Kill a tmux pane."""
-    _execute_manager_command(ctx, 'kill_pane', window_index=window_index, pane_index=pane_index)
+# Reusable parameter specs for the manager-backed commands below. Each
+# spec is (param class, declarations, attributes); the click objects are
+# only constructed when a command is first looked up.
+_WINDOW_OPT = (click.Option, ('--window', 'window_index'),
+               {'type': int, 'required': True, 'help': 'Window index'})
+_PANE_OPT = (click.Option, ('--pane', 'pane_index'),
+             {'type': int, 'required': True, 'help': 'Pane index'})
+
+
+def _invert_no_enter(kwargs: Dict[str, Any]) -> None:
+    kwargs['enter'] = not kwargs.pop('no_enter')
+
+
+# Declarative table of the commands that just forward to a TmuxManager
+# method: attribute name -> (CLI name, manager method, help, parameter
+# specs, optional kwargs fixup run before dispatch).
+_MANAGER_COMMANDS = {
+    'create_window': (
+        'create-window', 'create_window', 'Create a new tmux window.',
+        [(click.Option, ('--name', 'window_name'), {'required': True, 'help': 'Window name'}),
+         (click.Option, ('--command',), {'help': 'Command to run in the window'}),
+         (click.Option, ('--shell',), {'default': '/bin/bash', 'help': 'Shell to use in the window'})],
+        None),
+    'create_pane': (
+        'create-pane', 'create_pane', 'Split a window to create a new pane.',
+        [_WINDOW_OPT,
+         (click.Option, ('--vertical/--horizontal',), {'default': True, 'help': 'Split orientation'}),
+         (click.Option, ('--command',), {'help': 'Command to run in the new pane'})],
+        None),
+    'list_sessions': (
+        'list-sessions', 'list_sessions', 'List all tmux sessions.',
+        [],
+        None),
+    'list_windows': (
+        'list-windows', 'list_windows', 'List all windows in a session.',
+        [(click.Option, ('--session', 'session_name'), {'help': 'Session name to list windows from'})],
+        None),
+    'list_panes': (
+        'list-panes', 'list_panes', 'List all panes in a window.',
+        [_WINDOW_OPT],
+        None),
+    'send_command': (
+        'send', 'send_command', 'Send a command to a pane.',
+        [_WINDOW_OPT, _PANE_OPT,
+         (click.Argument, ('command',), {}),
+         (click.Option, ('--no-enter',), {'is_flag': True, 'help': 'Do not send Enter after command'})],
+        _invert_no_enter),
+    'capture_pane': (
+        'capture-pane', 'capture_pane', 'Capture output from a pane.',
+        [_WINDOW_OPT, _PANE_OPT,
+         (click.Option, ('--lines',), {'default': 100, 'help': 'Number of lines to capture'}),
+         (click.Option, ('--format', 'output_format'),
+          {'type': click.Choice(['text', 'lines']), 'default': 'text',
+           'help': 'Return content as one string or as a list of lines'})],
+        None),
+    'wait_idle': (
+        'wait-idle', 'wait_idle', 'Wait for a pane to be idle.',
+        [_WINDOW_OPT, _PANE_OPT,
+         (click.Option, ('--timeout',), {'default': 30, 'help': 'Timeout in seconds'}),
+         (click.Option, ('--quiet-for', 'quiet_for'),
+          {'default': 2, 'help': 'Seconds of no output to consider idle'}),
+         (click.Option, ('--poll-interval', 'poll_interval'),
+          {'default': 0.1, 'help': 'Polling interval in seconds'})],
+        None),
+    'kill_window': (
+        'kill-window', 'kill_window', 'Kill a tmux window.',
+        [(click.Option, ('--window', 'window_index'),
+          {'type': int, 'required': True, 'help': 'Window index to kill'})],
+        None),
+    'kill_pane': (
+        'kill-pane', 'kill_pane', 'Kill a tmux pane.',
+        [_WINDOW_OPT,
+         (click.Option, ('--pane', 'pane_index'),
+          {'type': int, 'required': True, 'help': 'Pane index to kill'})],
+        None),
+    'status': (
+        'status', 'list_windows', 'Show current tmux status.',
+        [],
+        None),
+}
+
+
+def _build_manager_command(attr: str) -> click.Command:
+    """Construct one click.Command from its _MANAGER_COMMANDS entry."""
+    cli_name, method_name, help_text, param_specs, fixup = _MANAGER_COMMANDS[attr]
+
+    @click.pass_context
+    def callback(ctx: click.Context, **kwargs) -> None:
+        if fixup is not None:
+            fixup(kwargs)
+        _execute_manager_command(ctx, method_name, **kwargs)
+
+    params = [cls(list(decls), **attrs) for cls, decls, attrs in param_specs]
+    return click.Command(cli_name, params=params, callback=callback, help=help_text)
+
+
+def __getattr__(name: str):
+    """Build manager-backed commands on first attribute access (PEP 562).
+
+    Invoking one subcommand never pays for constructing the click
+    Option/Command objects of the other seventeen; the built command is
+    cached in module globals so later lookups are plain attribute reads.
+    """
+    if name in _MANAGER_COMMANDS:
+        command = globals()[name] = _build_manager_command(name)
+        return command
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @click.command()
@@ -188,24 +255,14 @@ def set_tab_color(ctx: click.Context, window_index: int, red: int, green: int, b
 @click.pass_context
 def detect(ctx: click.Context) -> None:
     """Detect environment capabilities."""
-    import os
-
+    env = os.environ
+    inside_tmux = bool(env.get('TMUX'))
     result = {
         "status": "success",
-        "iterm2": os.environ.get('TERM_PROGRAM') == 'iTerm.app',
-        "tmux": bool(os.environ.get('TMUX')),
-        "shell_integration": any([
-            os.path.exists(os.path.expanduser('~/.iterm2_shell_integration.bash')),
-            os.path.exists(os.path.expanduser('~/.iterm2_shell_integration.zsh'))
-        ]),
+        "iterm2": env.get('TERM_PROGRAM') == 'iTerm.app',
+        "tmux": inside_tmux,
+        "shell_integration": _shell_integration_present(),
         "session": ctx.obj.get('SESSION', 'claude-dev'),
-        "inside_tmux": bool(os.environ.get('TMUX'))
+        "inside_tmux": inside_tmux
     }
-    output_result(result)
-
-
-@click.command()
-@click.pass_context
-def status(ctx: click.Context) -> None:
-    """Show current tmux status."""
-    _execute_manager_command(ctx, 'list_windows')
\ No newline at end of file
+    output_result(result)
\ No newline at end of file
@@ -1,8 +1,10 @@
 """Core TmuxManager class using libtmux for tmux operations."""
 import os
+import select
+import subprocess
 import time
 import base64
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
 import libtmux
@@ -12,20 +14,59 @@ from libtmux.window import Window
 from libtmux.pane import Pane
 
 
+class _ControlReply:
+    """Reply from the control-mode client, shaped like libtmux's tmux_cmd."""
+    __slots__ = ('stdout', 'stderr')
+
+    def __init__(self, stdout: List[str], stderr: List[str]):
+        self.stdout = stdout
+        self.stderr = stderr
+
+
+# Constant argv prefix for the control-mode client spawn
+_CTL_ATTACH_ARGV = ('tmux', '-C', 'attach-session', '-t')
+
+
+def _ctl_quote(arg: Any) -> str:
+    """Quote an argument for a tmux control-mode command line."""
+    arg = str(arg)
+    if arg == ';':
+        # A bare semicolon separates tmux commands, as in argv form
+        return ';'
+    if arg and not any(c in arg for c in ' \t\'"\\;#$~{}'):
+        return arg
+    return "'" + arg.replace("'", "'\\''") + "'"
+
+
 class TmuxManager:
     """Manages tmux operations for coding agents."""
-    
-    def __init__(self, session_name: str = "claude-dev", verbose: bool = False):
+
+    def __init__(self, session_name: str = "claude-dev", verbose: bool = False,
+                 control_mode: bool = True):
         self.server = Server()
         self.session_name = session_name
         self.verbose = verbose
         self._session: Optional[Session] = None
+        self._session_id: Optional[str] = None
         self.inside_tmux = bool(os.environ.get('TMUX'))
+        # Long-lived `tmux -C` client; opened lazily so a manager that
+        # never runs a tmux command never forks one.
+        self._control_mode = control_mode
+        self._ctl: Optional[subprocess.Popen] = None
+        self._ctl_buf = b''
+        # (timestamp, panes) snapshot of every pane in the session
+        # (timestamp, pane rows, {(window, pane): pane_id} lookup index)
+        self._panes_cache: Tuple[float, List[Dict[str, Any]], Dict[Tuple[int, int], str]] = (0.0, [], {})
+
+    def _resolve_session(self) -> None:
+        """Locate the target session, falling back to the first available one."""
+        if self._session is not None:
+            return
 
         # Try to get the specified session (must already exist)
         sessions = self.server.sessions
         for session in sessions:
-            if session.name == session_name:
+            if session.name == self.session_name:
                 self._session = session
                 break
 
@@ -34,38 +75,226 @@ class TmuxManager:
             session = sessions[0]
             self._session = session
             self.session_name = session.name
-    
-    
+
     @property
     def session(self) -> Session:
-        """Get the current tmux session."""
+        """Get the current tmux session, resolving it lazily on first use.
+
+        Deferring the lookup keeps constructing a TmuxManager free of tmux
+        queries, so commands that never touch the session don't pay for one.
+        """
+        self._resolve_session()
         if self._session is None:
             raise RuntimeError("No tmux session available - please ensure at least one session exists")
         return self._session
+
+    def _resolve_target(self) -> None:
+        """Resolve the session id for -t targets.
+
+        One formatted list-sessions call parsed with str.partition — no
+        per-session libtmux wrapper objects. Falls back to the first
+        available session, mirroring the Session-object resolution.
+        """
+        if self._session_id is not None:
+            return
+        if self._session is not None:
+            # Already resolved as a libtmux object; reuse its id
+            self._session_id = self._session.session_id
+            return
+
+        proc = self.server.cmd('list-sessions', '-F', '#{session_name}\t#{session_id}')
+        first = None
+        for line in proc.stdout or []:
+            name, _, session_id = line.partition('\t')
+            if name == self.session_name:
+                self._session_id = session_id
+                return
+            if first is None:
+                first = (name, session_id)
+
+        if first is not None:
+            self.session_name, self._session_id = first
+
+    def _window_target(self, window_index: int) -> str:
+        """tmux target string for a window, e.g. '$1:0'.
+
+        Built on the session id rather than the name, so targets stay
+        valid across session renames.
+        """
+        self._resolve_target()
+        return f'{self._session_id or self.session_name}:{window_index}'
+
+    def _ctl_connect(self) -> Optional[subprocess.Popen]:
+        """Open the long-lived control-mode client on first use.
+
+        One `tmux -C attach` process serves every subsequent command over
+        its stdin/stdout pipes, so N operations cost one fork instead of N.
+        Any failure permanently disables control mode for this manager and
+        callers fall back to one-shot clients via libtmux.
+        """
+        if self._ctl is None and self._control_mode:
+            self._resolve_target()
+            try:
+                # close_fds=False skips the /proc/self/fd walk and keeps
+                # the spawn on CPython's posix_spawn fast path; the client
+                # is ours for the process lifetime, so inherited fds are
+                # not a concern
+                self._ctl = subprocess.Popen(
+                    [*_CTL_ATTACH_ARGV, self._session_id or self.session_name],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL, close_fds=False)
+            except OSError:
+                self._control_mode = False
+                return None
+            # tmux acknowledges the attach with an (empty) reply block
+            if self._ctl_read_reply() is None:
+                self.close()
+                self._control_mode = False
+        return self._ctl
+
+    def _ctl_readline(self, deadline: float) -> Optional[bytes]:
+        """Read one line from the control-mode client, without blocking past
+        `deadline`. Returns None on timeout; raises EOFError if tmux hung up."""
+        while b'\n' not in self._ctl_buf:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            ready, _, _ = select.select([self._ctl.stdout], [], [], remaining)
+            if not ready:
+                return None
+            chunk = os.read(self._ctl.stdout.fileno(), 65536)
+            if not chunk:
+                raise EOFError("tmux control-mode client closed the connection")
+            self._ctl_buf += chunk
+        line, _, self._ctl_buf = self._ctl_buf.partition(b'\n')
+        return line
+
+    def _ctl_read_reply(self, timeout: float = 5.0) -> Optional[_ControlReply]:
+        """Read one %begin..%end/%error reply, skipping async notifications."""
+        deadline = time.time() + timeout
+        lines: List[str] = []
+        in_reply = False
+        try:
+            while True:
+                raw = self._ctl_readline(deadline)
+                if raw is None:
+                    return None
+                line = raw.decode('utf-8', 'replace')
+                if line.startswith('%begin'):
+                    in_reply = True
+                    lines = []
+                elif in_reply and line.startswith('%end'):
+                    return _ControlReply(lines, [])
+                elif in_reply and line.startswith('%error'):
+                    return _ControlReply([], lines)
+                elif in_reply:
+                    lines.append(line)
+                # Lines outside a reply block are async notifications
+                # (%output, %window-add, ...) and are dropped here.
+        except EOFError:
+            return None
+
+    def _ctl_run(self, args: Tuple[Any, ...]) -> Optional[_ControlReply]:
+        """Run one tmux command over the control-mode client, or return None
+        so the caller can fall back to a one-shot client."""
+        # Control-mode commands are newline-terminated lines; an embedded
+        # newline would split the command mid-argument even inside quotes.
+        # Route such arguments through the one-shot argv client, which has
+        # no framing to corrupt.
+        if any('\n' in arg or '\r' in arg for arg in map(str, args)):
+            return None
+        if self._ctl_connect() is None:
+            return None
+        line = ' '.join(_ctl_quote(arg) for arg in args) + '\n'
+        # tmux answers with one %begin..%end block per command, so a line
+        # joined with ';' separators produces several replies to drain.
+        expected_replies = 1 + sum(1 for arg in args if arg == ';')
+        try:
+            self._ctl.stdin.write(line.encode('utf-8'))
+            self._ctl.stdin.flush()
+            stdout: List[str] = []
+            stderr: List[str] = []
+            reply: Optional[_ControlReply] = None
+            for _ in range(expected_replies):
+                part = self._ctl_read_reply()
+                if part is None:
+                    reply = None
+                    break
+                stdout.extend(part.stdout)
+                stderr.extend(part.stderr)
+                reply = _ControlReply(stdout, stderr)
+        except OSError:
+            reply = None
+        if reply is None:
+            # The connection is unusable; drop it and stop trying
+            self.close()
+            self._control_mode = False
+        return reply
+
+    def _run(self, *args: Any):
+        """Run a tmux command, preferring the persistent control-mode client."""
+        reply = self._ctl_run(args)
+        if reply is not None:
+            return reply
+        return self.server.cmd(*args)
+
+    def close(self) -> None:
+        """Close the control-mode client, if one was opened."""
+        if self._ctl is not None:
+            try:
+                self._ctl.stdin.close()
+                self._ctl.terminate()
+                self._ctl.wait(timeout=1)
+            except Exception:
+                pass
+            self._ctl = None
+            self._ctl_buf = b''
+
+    def __enter__(self) -> "TmuxManager":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
     
     def create_window(self, window_name: str, command: Optional[str] = None, 
                      shell: str = "/bin/bash") -> Dict[str, Any]:
         """Create a new window in the session."""
         try:
-            # Create window with shell first (to prevent output loss)
+            # Create the window with tmux launching the requested shell
+            # directly, instead of typing it into the default shell and
+            # sleeping while the nested shell starts
             window = self.session.new_window(
                 window_name=window_name,
                 attach=False,
-                start_directory=None
+                start_directory=None,
+                window_shell=shell
             )
-            
+
+            self._invalidate_panes_cache()
+
             # Get the pane in the new window
             pane = window.active_pane
             if not pane:
                 raise RuntimeError("No attached pane found in new window")
-            
-            # Launch shell first
-            pane.send_keys(shell, enter=True)
-            time.sleep(0.2)  # Brief pause to ensure shell starts
-            
+
             # Send command if provided
             if command:
-                pane.send_keys(command, enter=True)
+                # Bounded readiness poll (~200 ms worst case) rather than a
+                # fixed sleep; the pane's current command flips to the
+                # shell once it has exec'd
+                for _ in range(40):
+                    if pane.pane_current_command and pane.pane_current_command != 'tmux':
+                        break
+                    time.sleep(0.005)
+                    pane.refresh()
+                self._run('send-keys', '-t', pane.pane_id, '-l', command, ';',
+                          'send-keys', '-t', pane.pane_id, 'Enter')
             
             result = {
                 "status": "success",
@@ -92,25 +321,28 @@ class TmuxManager:
                    command: Optional[str] = None) -> Dict[str, Any]:
         """Split a window to create a new pane."""
         try:
-            window = self.session.windows.get(window_index=str(window_index), default=None)
-            if not window:
+            # Split the window addressed directly by target; -P -F prints
+            # the new pane id so no follow-up lookup is needed
+            proc = self._run(
+                'split-window', '-d', '-v' if vertical else '-h',
+                '-t', self._window_target(window_index), '-P', '-F', '#{pane_id}')
+            if not proc.stdout:
                 return {
                     "status": "error",
                     "message": f"Window {window_index} not found",
                     "code": "WINDOW_NOT_FOUND"
                 }
+            pane_id = proc.stdout[0]
+            self._invalidate_panes_cache()
 
-            # Split the window to create a new pane
-            split_method = 'v' if vertical else 'h'
-            new_pane = window.split_window(attach=False, vertical=vertical)
-            
             # Send command if provided
             if command:
-                new_pane.send_keys(command, enter=True)
-            
+                self._run('send-keys', '-t', pane_id, '-l', command, ';',
+                                'send-keys', '-t', pane_id, 'Enter')
+
             result = {
                 "status": "success",
-                "pane_id": new_pane.pane_id,
+                "pane_id": pane_id,
                 "window_index": window_index,
                 "orientation": "vertical" if vertical else "horizontal",
                 "session": self.session_name
@@ -127,31 +359,84 @@ class TmuxManager:
                 "code": "CREATE_PANE_FAILED"
             }
     
+    _PANES_FORMAT = '#{window_index} #{pane_index} #{pane_id} #{pane_active} #{pane_height} #{pane_width}'
+
+    def _all_panes(self, ttl: float = 0.25) -> List[Dict[str, Any]]:
+        """Snapshot every pane in the session with one tmux call.
+
+        The snapshot is cached for `ttl` seconds, so a burst of lookups
+        across different windows costs a single round trip. Mutating
+        operations call _invalidate_panes_cache(). Indices are parsed to
+        int once here so lookups compare ints instead of tmux strings.
+        """
+        cached_at, panes, _ = self._panes_cache
+        now = time.time()
+        if now - cached_at < ttl:
+            return panes
+
+        self._resolve_target()
+        proc = self._run('list-panes', '-s', '-t',
+                         self._session_id or self.session_name,
+                         '-F', self._PANES_FORMAT)
+        panes = []
+        index = {}
+        for line in proc.stdout or []:
+            window_index, pane_index, pane_id, active, height, width = line.split(' ')
+            window_index = int(window_index)
+            pane_index = int(pane_index)
+            panes.append({
+                'window_index': window_index,
+                'pane_index': pane_index,
+                'pane_id': pane_id,
+                'pane_active': active,
+                'pane_height': height,
+                'pane_width': width,
+            })
+            index[(window_index, pane_index)] = pane_id
+        self._panes_cache = (now, panes, index)
+        return panes
+
+    def _invalidate_panes_cache(self) -> None:
+        """Drop the pane snapshot after anything that changes the layout."""
+        self._panes_cache = (0.0, [], {})
+
     def _find_pane_by_index(self, window_index: int, pane_index: int) -> tuple:
-        """Helper method to find a pane by window and pane index."""
-        window = self.session.windows.get(window_index=str(window_index), default=None)
-        if not window:
-            return None, None, f"Window {window_index} not found"
+        """Resolve a pane to its tmux pane id from the cached pane snapshot.
 
-        for pane in window.panes:
-            if pane.pane_index == str(pane_index):
-                return window, pane, None
+        Returns a ``(pane_id, error_message, error_code)`` tuple. Note
+        display-message -t silently falls back to the current pane on a bad
+        target, so existence is checked against the snapshot instead.
+        """
+        self._all_panes()
+        index = self._panes_cache[2]
+        pane_id = index.get((window_index, pane_index))
+        if pane_id is not None:
+            return pane_id, None, None
 
-        return window, None, f"Pane {pane_index} not found in window {window_index}"
+        if any(window == window_index for window, _ in index):
+            return None, f"Pane {pane_index} not found in window {window_index}", "PANE_NOT_FOUND"
+        return None, f"Window {window_index} not found", "WINDOW_NOT_FOUND"
 
     def send_command(self, window_index: int, pane_index: int,
                     command: str, enter: bool = True) -> Dict[str, Any]:
         """Send a command to a specific pane."""
         try:
-            window, target_pane, error = self._find_pane_by_index(window_index, pane_index)
+            pane_id, error, code = self._find_pane_by_index(window_index, pane_index)
             if error:
                 return {
                     "status": "error",
                     "message": error,
-                    "code": "PANE_NOT_FOUND"
+                    "code": code
                 }
 
-            target_pane.send_keys(command, enter=enter)
+            # Send the literal keys and Enter in one tmux client invocation
+            # (';' separates tmux commands) instead of libtmux's send_keys,
+            # which forks a separate client per segment.
+            if enter:
+                self._run('send-keys', '-t', pane_id, '-l', command, ';',
+                                'send-keys', '-t', pane_id, 'Enter')
+            else:
+                self._run('send-keys', '-t', pane_id, '-l', command)
 
             result = {
                 "status": "success",
@@ -173,37 +458,50 @@ class TmuxManager:
             }
 
     def capture_pane(self, window_index: int, pane_index: int,
-                    lines: int = 100) -> Dict[str, Any]:
-        """Capture output from a specific pane."""
+                    lines: int = 100, output_format: str = "text") -> Dict[str, Any]:
+        """Capture output from a specific pane.
+
+        With ``output_format="lines"`` the capture is returned as a list
+        under ``lines_data`` instead of one joined string, so the JSON
+        writer serializes the lines directly without materializing the
+        full text first.
+        """
         try:
-            window, target_pane, error = self._find_pane_by_index(window_index, pane_index)
+            pane_id, error, code = self._find_pane_by_index(window_index, pane_index)
             if error:
                 return {
                     "status": "error",
                     "message": error,
-                    "code": "PANE_NOT_FOUND"
+                    "code": code
                 }
 
-            # Capture pane content
-            result = target_pane.capture_pane()
+            # Capture pane content; -S -<lines> makes tmux start the
+            # capture <lines> above the visible area, so the scrollback
+            # tail is selected in C instead of materializing everything
+            # and slicing it here
+            result = self._run('capture-pane', '-p', '-S', f'-{lines}', '-t', pane_id).stdout
 
             if result is None:
                 result = []
 
-            # Only return the requested number of lines from the end
+            # The visible area can push the total past the request; trim
+            # to the requested tail
             if len(result) > lines:
                 result = result[-lines:]
 
-            output = '\n'.join(result) if result else ''
-
-            return {
+            capture = {
                 "status": "success",
-                "content": output,
                 "lines": len(result),
                 "window_index": window_index,
                 "pane_index": pane_index,
                 "session": self.session_name
             }
+            if output_format == "lines":
+                capture["lines_data"] = result
+            else:
+                capture["content"] = '\n'.join(result) if result else ''
+
+            return capture
         except Exception as e:
             return {
                 "status": "error",
@@ -215,27 +513,40 @@ class TmuxManager:
                  timeout: int = 30, quiet_for: int = 2, poll_interval: float = 0.1) -> Dict[str, Any]:
         """Wait for a pane to be idle (no output for quiet_for seconds)."""
         try:
-            window, target_pane, error = self._find_pane_by_index(window_index, pane_index)
+            pane_id, error, code = self._find_pane_by_index(window_index, pane_index)
             if error:
                 return {
                     "status": "error",
                     "message": error,
-                    "code": "PANE_NOT_FOUND"
+                    "code": code
                 }
 
+            # With a live control-mode client tmux pushes %output
+            # notifications as pane bytes arrive, so we can block on the
+            # pipe instead of forking capture-pane every poll tick
+            if self._control_mode and self._ctl_connect() is not None:
+                result = self._wait_idle_events(
+                    pane_id, window_index, pane_index, timeout, quiet_for)
+                if result is not None:
+                    return result
+                # Control connection dropped mid-wait; fall back to polling
+
             start_time = time.time()
-            last_content = ""
+            base_interval = poll_interval
+            last_fingerprint = None
             last_change_time = start_time
 
             while time.time() - start_time < timeout:
-                current_content = target_pane.capture_pane()
-                if current_content is None:
-                    current_content = []
-                current_content_str = '\n'.join(current_content) if current_content else ''
+                # Capture only the visible pane and compare a cheap
+                # fingerprint (line count + last line) rather than joining
+                # and diffing the whole scrollback every tick.
+                lines = self._run('capture-pane', '-p', '-t', pane_id).stdout or []
+                fingerprint = (len(lines), lines[-1] if lines else '')
 
-                if current_content_str != last_content:
-                    last_content = current_content_str
+                if fingerprint != last_fingerprint:
+                    last_fingerprint = fingerprint
                     last_change_time = time.time()
+                    poll_interval = base_interval
                 elif time.time() - last_change_time >= quiet_for:
                     elapsed = time.time() - start_time
                     return {
@@ -245,8 +556,12 @@ class TmuxManager:
                         "pane_index": pane_index,
                         "session": self.session_name
                     }
+                else:
+                    # Back off while the pane stays quiet; the cap keeps a
+                    # late wake-up from overshooting the quiet window.
+                    poll_interval = min(poll_interval * 1.5, quiet_for / 4)
 
-                time.sleep(poll_interval)  # Made configurable for efficiency optimization
+                time.sleep(poll_interval)
 
             elapsed = time.time() - start_time
             return {
@@ -264,6 +579,50 @@ class TmuxManager:
                 "code": "WAIT_IDLE_FAILED"
             }
     
+    def _wait_idle_events(self, pane_id: str, window_index: int, pane_index: int,
+                          timeout: int, quiet_for: int) -> Optional[Dict[str, Any]]:
+        """Wait for quiet using control-mode %output notifications.
+
+        Blocks in select() until the pane produces bytes or the quiet
+        window elapses — one wake-up per activity edge rather than one per
+        poll interval, and no capture-pane forks at all. Returns None if
+        the control connection drops, so the caller can fall back to the
+        polling loop.
+        """
+        start_time = time.time()
+        last_change_time = start_time
+        pane_token = pane_id.encode('utf-8')
+        while True:
+            now = time.time()
+            if now - last_change_time >= quiet_for:
+                return {
+                    "status": "success",
+                    "elapsed": now - start_time,
+                    "window_index": window_index,
+                    "pane_index": pane_index,
+                    "session": self.session_name
+                }
+            if now - start_time >= timeout:
+                return {
+                    "status": "timeout",
+                    "elapsed": now - start_time,
+                    "timeout": timeout,
+                    "window_index": window_index,
+                    "pane_index": pane_index,
+                    "session": self.session_name
+                }
+
+            deadline = min(start_time + timeout, last_change_time + quiet_for)
+            try:
+                raw = self._ctl_readline(deadline)
+            except EOFError:
+                self.close()
+                self._control_mode = False
+                return None
+            if (raw is not None and raw.startswith(b'%output ')
+                    and raw.split(b' ', 2)[1] == pane_token):
+                last_change_time = time.time()
+
     def list_sessions(self) -> Dict[str, Any]:
         """List all tmux sessions."""
         try:
@@ -326,26 +685,25 @@ class TmuxManager:
     def list_panes(self, window_index: int) -> Dict[str, Any]:
         """List all panes in a specific window."""
         try:
-            window = self.session.windows.get(window_index=str(window_index), default=None)
-            if not window:
+            # Filter the cached session-wide pane snapshot; a window always
+            # has at least one pane, so no match means it doesn't exist
+            pane_list = [
+                {
+                    "id": pane['pane_id'],
+                    "index": pane['pane_index'],
+                    "active": pane['pane_active'] == "1",
+                    "height": int(pane['pane_height']),
+                    "width": int(pane['pane_width'])
+                }
+                for pane in self._all_panes() if pane['window_index'] == window_index
+            ]
+            if not pane_list:
                 return {
                     "status": "error",
                     "message": f"Window {window_index} not found",
                     "code": "WINDOW_NOT_FOUND"
                 }
-            
-            panes = window.panes
-            pane_list = []
-            for pane in panes:
-                pane_info = {
-                    "id": pane.pane_id,
-                    "index": int(pane.pane_index),
-                    "active": pane.pane_active == "1",
-                    "height": int(pane.pane_height),
-                    "width": int(pane.pane_width)
-                }
-                pane_list.append(pane_info)
-            
+
             return {
                 "status": "success",
                 "window_index": window_index,
@@ -361,16 +719,15 @@ class TmuxManager:
     def kill_window(self, window_index: int) -> Dict[str, Any]:
         """Kill a window in the session."""
         try:
-            window = self.session.windows.get(window_index=str(window_index), default=None)
-            if not window:
+            proc = self._run('kill-window', '-t', self._window_target(window_index))
+            self._invalidate_panes_cache()
+            if proc.stderr:
                 return {
                     "status": "error",
                     "message": f"Window {window_index} not found",
                     "code": "WINDOW_NOT_FOUND"
                 }
 
-            window.kill_window()
-            
             return {
                 "status": "success",
                 "window_index": window_index,
@@ -386,30 +743,17 @@ class TmuxManager:
     def kill_pane(self, window_index: int, pane_index: int) -> Dict[str, Any]:
         """Kill a pane in a specific window."""
         try:
-            window = self.session.windows.get(window_index=str(window_index), default=None)
-            if not window:
+            pane_id, error, code = self._find_pane_by_index(window_index, pane_index)
+            if error:
                 return {
                     "status": "error",
-                    "message": f"Window {window_index} not found",
-                    "code": "WINDOW_NOT_FOUND"
+                    "message": error,
+                    "code": code
                 }
 
-            # Find the pane by index within the window
-            target_pane = None
-            for pane in window.panes:
-                if pane.pane_index == str(pane_index):
-                    target_pane = pane
-                    break
-            
-            if not target_pane:
-                return {
-                    "status": "error",
-                    "message": f"Pane {pane_index} not found in window {window_index}",
-                    "code": "PANE_NOT_FOUND"
-                }
-            
-            target_pane.kill()
-            
+            self._run('kill-pane', '-t', pane_id)
+            self._invalidate_panes_cache()
+
             return {
                 "status": "success",
                 "window_index": window_index,
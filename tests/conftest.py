@@ -1,20 +1,144 @@
 """Pytest configuration for tmux-iterm-command tests."""
+import copy
+import pathlib
 import sys
-import os
+from unittest.mock import Mock
+
 import pytest
 
-# Add src to path so we can import the module
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Add src to path once for the whole suite; individual test modules rely
+# on conftest running first instead of repeating this header.
+sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / 'src'))
+
+# Stub libtmux before the manager imports it: every test mocks the Server
+# anyway, and skipping the real package keeps collection free of its
+# import cost. Guarded so an already-imported real libtmux is left alone.
+if 'libtmux' not in sys.modules:
+    import types
+
+    _libtmux = types.ModuleType('libtmux')
+    for _submodule, _cls in (('server', 'Server'), ('session', 'Session'),
+                             ('window', 'Window'), ('pane', 'Pane')):
+        _mod = types.ModuleType(f'libtmux.{_submodule}')
+        setattr(_mod, _cls, type(_cls, (), {}))
+        setattr(_libtmux, _submodule, _mod)
+        setattr(_libtmux, _cls, getattr(_mod, _cls))
+        sys.modules[f'libtmux.{_submodule}'] = _mod
+    sys.modules['libtmux'] = _libtmux
+
+import tmux_iterm_command.manager as manager_mod
+from tmux_iterm_command.manager import TmuxManager
+
+
+@pytest.fixture(scope='session')
+def _tmux_mocks():
+    """Build the mocked Server/Session graph and the manager once per run.
+
+    Constructing the patch context and TmuxManager is the expensive part
+    of setup, so it happens once; per-test isolation comes from the
+    function-scoped fixtures below, which reset mock call history and the
+    manager's cached state instead of rebuilding everything.
+    """
+    mock_server = Mock()
+    mock_session = Mock()
+    mock_session.session_id = '@1'
+    mock_session.name = 'test-session'
+    mock_server.sessions = [mock_session]
+    mock_server.new_session.return_value = mock_session
+
+    # Swap the Server class by plain attribute assignment — far cheaper
+    # than a mock.patch context and only needed during construction
+    _orig_server = manager_mod.Server
+    manager_mod.Server = lambda *args, **kwargs: mock_server
+    try:
+        # control_mode off so unit tests never spawn a real tmux client
+        manager = TmuxManager(session_name='test-session', control_mode=False)
+    finally:
+        manager_mod.Server = _orig_server
+    return manager, mock_server, mock_session
+
+
+@pytest.fixture
+def manager(_tmux_mocks):
+    """The shared TmuxManager, with mocks and cached state reset."""
+    manager, mock_server, mock_session = _tmux_mocks
+    mock_server.reset_mock(return_value=True, side_effect=True)
+    mock_session.reset_mock(return_value=True, side_effect=True)
+    mock_server.sessions = [mock_session]
+    manager._session = None
+    manager._session_id = None
+    manager._invalidate_panes_cache()
+    return manager
+
+
+@pytest.fixture
+def mock_server(_tmux_mocks, manager):
+    """The mocked libtmux Server backing the shared manager."""
+    return _tmux_mocks[1]
+
+
+@pytest.fixture
+def mock_session(_tmux_mocks, manager):
+    """The mocked libtmux Session backing the shared manager."""
+    return _tmux_mocks[2]
+
+
+@pytest.fixture(scope='session', autouse=True)
+def _no_real_sleep():
+    """Stub time.sleep for the whole run via direct attribute swap.
+
+    TmuxManager polls with short sleeps (create_window readiness,
+    wait_idle fallback); none of the mocked tests need real delays, and
+    the plain-assignment swap avoids mock.patch overhead. time.time is
+    left alone — the pane-snapshot TTL depends on it advancing.
+    """
+    import time
+    orig_sleep = time.sleep
+    time.sleep = lambda _seconds: None
+    yield
+    time.sleep = orig_sleep
+
+
+class _FakePane:
+    """Slotted stand-in for a libtmux Pane used as a pure data holder.
+
+    Attribute reads on a slotted class are C-level offset loads, versus
+    Mock's __getattr__ walking its children dict; use this wherever no
+    call assertions are needed.
+    """
+    __slots__ = ('pane_id', 'pane_index', 'pane_active', 'pane_height', 'pane_width')
+
+    def __init__(self, **attrs):
+        for name, value in attrs.items():
+            setattr(self, name, value)
+
+
+# Prototype window mock built once at import; tests receive shallow
+# copies, shifting cost from one Mock graph per test to one copy per test.
+_WINDOW_PROTO = Mock()
+_WINDOW_PROTO.index = '0'
+_WINDOW_PROTO.name = 'test-window'
+_WINDOW_PROTO.window_active = '1'
+# Attribute access auto-creates the child mock; no explicit Mock() needed
+_WINDOW_PROTO.active_pane.pane_id = '%0'
+# Only the pane count is asserted, so empty slotted stubs suffice here
+_WINDOW_PROTO.panes = [_FakePane(), _FakePane()]
+
+
+@pytest.fixture
+def mock_window():
+    """A copied window mock with clean call history."""
+    window = copy.copy(_WINDOW_PROTO)
+    window.reset_mock(return_value=True, side_effect=True)
+    return window
 
 
 @pytest.fixture
 def mock_tmux_manager():
     """Provide a mocked TmuxManager for testing."""
-    from unittest.mock import Mock, patch
-    
     # Create a mock manager
     mock_manager = Mock()
     mock_manager.session_name = "test-session"
     mock_manager.verbose = False
-    
-    return mock_manager
\ No newline at end of file
+
+    return mock_manager
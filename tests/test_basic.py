@@ -1,11 +1,12 @@
 """Basic tests for tmux-iterm-command functionality."""
+import click
 import pytest
 import json
 from unittest.mock import Mock, patch
 
-from claude_tmux.manager import TmuxManager
-from claude_tmux.cli import main
-from claude_tmux.commands import create_window, list_windows
+from tmux_iterm_command.manager import TmuxManager
+from tmux_iterm_command.cli import main
+from tmux_iterm_command.commands import create_window, list_windows
 
 
 def test_tmux_manager_initialization():
@@ -28,4 +29,4 @@ def test_json_output_format():
 
 def test_create_window_command_structure():
     """Test that create_window command has the right structure."""
-    assert hasattr(create_window, '__click_params__')  # Check if it's a click command
\ No newline at end of file
+    assert isinstance(create_window, click.Command)  # Check if it's a click command
\ No newline at end of file
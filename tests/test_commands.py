@@ -1,42 +1,23 @@
 """Tests for CLI commands."""
 import json
-import sys
-import os
-from io import StringIO
-from unittest.mock import Mock, patch
 import pytest
 
-# Add src to path so we can import the module
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
+# conftest.py puts src/ on sys.path before test modules import
 from tmux_iterm_command.commands import output_result
 
 
-def test_output_result_function():
+def test_output_result_function(capsysbinary):
     """Test that output_result function works correctly."""
-    # Capture stdout
-    captured_output = StringIO()
-    
     test_result = {"status": "success", "data": {"test": "value"}}
-    
-    # Since print() goes to sys.stdout, we need to capture it differently
-    import builtins
-    original_print = builtins.print
-    
-    printed_output = []
-    def mock_print(*args, **kwargs):
-        printed_output.extend(args)
-    
-    builtins.print = mock_print
-    try:
-        output_result(test_result)
-        # Should have printed JSON string
-        assert len(printed_output) == 1
-        parsed = json.loads(printed_output[0])
-        assert parsed["status"] == "success"
-        assert parsed["data"]["test"] == "value"
-    finally:
-        builtins.print = original_print
+
+    output_result(test_result)
+
+    # Should have written one newline-terminated JSON line to stdout
+    out = capsysbinary.readouterr().out
+    assert out.endswith(b'\n')
+    parsed = json.loads(out)
+    assert parsed["status"] == "success"
+    assert parsed["data"]["test"] == "value"
 
 
 def test_command_functions_exist():
@@ -50,9 +31,10 @@ def test_command_functions_exist():
     assert hasattr(cmd_module, 'capture_pane')
     assert hasattr(cmd_module, 'kill_window')
     
-    # Check that they have the expected attributes of Click commands
-    assert hasattr(cmd_module.create_window, '__click_params__')
-    assert hasattr(cmd_module.list_windows, '__click_params__')
-    assert hasattr(cmd_module.send_command, '__click_params__')
-    assert hasattr(cmd_module.capture_pane, '__click_params__')
-    assert hasattr(cmd_module.kill_window, '__click_params__')
\ No newline at end of file
+    # Check that they are Click commands
+    import click
+    assert isinstance(cmd_module.create_window, click.Command)
+    assert isinstance(cmd_module.list_windows, click.Command)
+    assert isinstance(cmd_module.send_command, click.Command)
+    assert isinstance(cmd_module.capture_pane, click.Command)
+    assert isinstance(cmd_module.kill_window, click.Command)
\ No newline at end of file
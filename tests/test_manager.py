@@ -1,220 +1,210 @@
-"""Comprehensive tests for tmux-iterm-command functionality."""
+"""Comprehensive tests for tmux-iterm-command functionality.
+
+The manager and its mocked Server/Session come from the shared
+session-scoped fixtures in conftest.py; each test receives them
+freshly reset.
+"""
 import json
-import sys
-import os
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
 import pytest
 
-# Add src to path so we can import the module
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
+# conftest.py puts src/ on sys.path before test modules import
 from tmux_iterm_command.manager import TmuxManager
 
 
-class TestTmuxManager:
-    """Tests for TmuxManager class."""
-    
-    def setup_method(self):
-        """Set up test fixtures before each test method."""
-        # Mock the libtmux Server to avoid requiring actual tmux
-        self.mock_server = Mock()
-        self.mock_session = Mock()
-        self.mock_session.session_id = '@1'
-        self.mock_session.name = 'test-session'
-        self.mock_server.sessions = [self.mock_session]
-        self.mock_server.new_session.return_value = self.mock_session
-
-        # Patch the Server class in the manager module
-        with patch('tmux_iterm_command.manager.Server') as mock_server_class:
-            mock_server_class.return_value = self.mock_server
-            self.manager = TmuxManager(session_name='test-session')
-    
-    def test_create_window_success(self):
-        """Test successful window creation."""
-        # Mock the window and pane objects
-        mock_window = Mock()
-        mock_window.index = '0'
-        mock_window.active_pane = Mock()
-        mock_window.active_pane.send_keys = Mock()
-        mock_window.active_pane.pane_id = '%0'
-        
-        # Mock the session's new_window method
-        self.mock_session.new_window.return_value = mock_window
-        
-        result = self.manager.create_window(window_name='test', command='echo hello')
-        
-        assert result['status'] == 'success'
-        assert result['name'] == 'test'
-        assert 'window_id' in result
-        assert 'window_index' in result
-        
-        # Verify that new_window was called
-        self.mock_session.new_window.assert_called_once()
-    
-    def test_create_window_failure(self):
-        """Test window creation failure."""
-        # Mock the session's new_window method to raise an exception
-        self.mock_session.new_window.side_effect = Exception("Tmux error")
-        
-        result = self.manager.create_window(window_name='test', command='echo hello')
-        
-        assert result['status'] == 'error'
+
+# JSON result shapes validated by test_json_output_format, hoisted so the
+# dicts are built once at import
+_SUCCESS = {"status": "success", "data": {"test": "value"}, "message": "Test message"}
+_ERROR = {"status": "error", "message": "Something went wrong", "code": "TEST_ERROR"}
+# Canonical captured-pane content, allocated once for both capture tests
+_CAPTURE_LINES = ('line1', 'line2', 'line3')
+
+
+def _reply(*lines):
+    """Lightweight tmux_cmd reply stub: the manager only reads stdout/stderr."""
+    return SimpleNamespace(stdout=list(lines), stderr=[])
+
+
+@pytest.fixture
+def wire_pane_lookup(mock_server):
+    """Wire the reply prefix shared by every pane-targeting test.
+
+    Each of those tests starts with the same two replies — session target
+    resolution and the pane snapshot — so this returns a function that
+    installs them followed by any test-specific replies.
+    """
+    def _wire(*replies):
+        mock_server.cmd.side_effect = [
+            _reply('test-session\t$1'),     # list-sessions target resolution
+            _reply('0 0 %0 1 24 80'),       # pane snapshot resolution
+            *replies,
+        ]
+    return _wire
+
+
+@pytest.mark.parametrize("fail,expected_status,expected_code", [
+    (False, 'success', None),
+    (True, 'error', 'CREATE_WINDOW_FAILED'),
+])
+def test_create_window(manager, mock_session, mock_window,
+                       fail, expected_status, expected_code):
+    """Test window creation in the success and failure paths."""
+    if fail:
+        # Make the session's new_window method raise an exception
+        mock_session.new_window.side_effect = Exception("Tmux error")
+    else:
+        mock_session.new_window.return_value = mock_window
+
+    result = manager.create_window(window_name='test', command='echo hello')
+
+    if fail:
+        expected = {'status': expected_status, 'code': expected_code}
+        assert expected.items() <= result.items()
         assert 'message' in result
-        assert result['code'] == 'CREATE_WINDOW_FAILED'
-    
-    def test_create_pane_success(self):
-        """Test successful pane creation."""
-        # Mock the window and panes
-        mock_window = Mock()
-        mock_window.index = '0'
-        mock_window.split_window.return_value = Mock()
-        mock_window.split_window.pane_id = '%1'
-        mock_window.panes = []
-        
-        # Mock the session's windows.get method to return our mock window
-        mock_windows = Mock()
-        mock_windows.get.return_value = mock_window
-        self.mock_session.windows = mock_windows
-
-        result = self.manager.create_pane(window_index=0, vertical=True, command='echo test')
-        
-        assert result['status'] == 'success'
-        assert 'pane_id' in result
-        assert result['orientation'] == 'vertical'
-        
-        # Verify that split_window was called
-        mock_window.split_window.assert_called_once()
-    
-    def test_send_command_success(self):
-        """Test successful command sending."""
-        # Mock the window and pane
-        mock_window = Mock()
-        mock_window.index = '0'
-        mock_window.panes = [Mock()]
-        mock_window.panes[0].pane_index = '0'
-        mock_window.panes[0].send_keys = Mock()
-
-        # Mock the session's windows.get method to return our mock window
-        mock_windows = Mock()
-        mock_windows.get.return_value = mock_window
-        self.mock_session.windows = mock_windows
-
-        result = self.manager.send_command(window_index=0, pane_index=0, command='echo test')
-        
-        assert result['status'] == 'success'
-        assert result['command'] == 'echo test'
-        
-        # Verify that send_keys was called
-        mock_window.panes[0].send_keys.assert_called_once_with('echo test', enter=True)
-    
-    def test_capture_pane_success(self):
-        """Test successful pane capture."""
-        # Mock the window and pane
-        mock_window = Mock()
-        mock_window.index = '0'
-        mock_window.panes = [Mock()]
-        mock_window.panes[0].pane_index = '0'
-        mock_window.panes[0].capture_pane.return_value = ['line1', 'line2', 'line3']
-
-        # Mock the session's windows.get method to return our mock window
-        mock_windows = Mock()
-        mock_windows.get.return_value = mock_window
-        self.mock_session.windows = mock_windows
-
-        result = self.manager.capture_pane(window_index=0, pane_index=0)
-        
-        assert result['status'] == 'success'
-        assert 'content' in result
-        assert result['lines'] == 3
-        
-        # Verify that capture_pane was called
-        mock_window.panes[0].capture_pane.assert_called_once()
-    
-    def test_list_sessions_success(self):
-        """Test successful session listing."""
-        # Mock the server's sessions property
-        mock_session_obj = Mock()
-        mock_session_obj.session_id = '@1'
-        mock_session_obj.name = 'test-session'
-        mock_session_obj.session_attached = '1'
-        mock_session_obj.session_windows = '2'
-        self.mock_server.sessions = [mock_session_obj]
-
-        result = self.manager.list_sessions()
-
-        assert result['status'] == 'success'
-        assert len(result['sessions']) == 1
-        assert result['sessions'][0]['name'] == 'test-session'
-    
-    def test_list_windows_success(self):
-        """Test successful window listing."""
-        # Mock a window
-        mock_libtmux_window = Mock()
-        mock_libtmux_window.index = '0'
-        mock_libtmux_window.name = 'test-window'
-        mock_libtmux_window.window_active = '1'
-        mock_libtmux_window.panes = [Mock(), Mock()]  # 2 panes
-        
-        # Mock the session's windows property
-        self.mock_session.windows = [mock_libtmux_window]
-
-        result = self.manager.list_windows()
-        
-        assert result['status'] == 'success'
-        assert len(result['windows']) == 1
-        assert result['windows'][0]['name'] == 'test-window'
-        assert result['windows'][0]['panes'] == 2
-    
-    def test_list_panes_success(self):
-        """Test successful pane listing."""
-        # Mock panes
-        mock_pane1 = Mock()
-        mock_pane1.pane_id = '%0'
-        mock_pane1.pane_index = '0'
-        mock_pane1.pane_active = '1'
-        mock_pane1.pane_height = '24'
-        mock_pane1.pane_width = '80'
-        
-        mock_pane2 = Mock()
-        mock_pane2.pane_id = '%1'
-        mock_pane2.pane_index = '1'
-        mock_pane2.pane_active = '0'
-        mock_pane2.pane_height = '24'
-        mock_pane2.pane_width = '80'
-        
-        # Mock the window
-        mock_window = Mock()
-        mock_window.index = '0'
-        mock_window.panes = [mock_pane1, mock_pane2]
-
-        # Mock the session's windows.get method
-        mock_windows = Mock()
-        mock_windows.get.return_value = mock_window
-        self.mock_session.windows = mock_windows
-
-        result = self.manager.list_panes(window_index=0)
-        
-        assert result['status'] == 'success'
-        assert len(result['panes']) == 2
-        assert result['panes'][0]['id'] == '%0'
-        assert result['panes'][1]['active'] is False
+    else:
+        expected = {'status': expected_status, 'name': 'test'}
+        assert expected.items() <= result.items()
+        assert result.keys() >= {'window_id', 'window_index'}
+        mock_session.new_window.assert_called_once()
+
+
+@pytest.mark.parametrize("method,kwargs,expected_code", [
+    ('send_command', {'window_index': 9, 'pane_index': 0, 'command': 'x'},
+     'WINDOW_NOT_FOUND'),
+    ('capture_pane', {'window_index': 0, 'pane_index': 9}, 'PANE_NOT_FOUND'),
+    ('kill_pane', {'window_index': 9, 'pane_index': 0}, 'WINDOW_NOT_FOUND'),
+])
+def test_pane_lookup_errors(manager, wire_pane_lookup, method, kwargs, expected_code):
+    """Pane-targeting methods share the same lookup error shape."""
+    wire_pane_lookup()
+
+    result = getattr(manager, method)(**kwargs)
+
+    assert result['status'] == 'error'
+    assert result['code'] == expected_code
+
+
+def test_create_pane_success(manager, mock_server):
+    """Test successful pane creation."""
+    mock_server.cmd.side_effect = [
+        _reply('test-session\t$1'),  # list-sessions target resolution
+        _reply('%1'),                # split-window -P -F prints the new pane id
+        _reply(),                    # send-keys
+    ]
+
+    result = manager.create_pane(window_index=0, vertical=True, command='echo test')
+
+    expected = {'status': 'success', 'pane_id': '%1', 'orientation': 'vertical'}
+    assert expected.items() <= result.items()
+
+    # Verify the split targeted the window directly by session id
+    mock_server.cmd.assert_any_call(
+        'split-window', '-d', '-v', '-t', '$1:0', '-P', '-F', '#{pane_id}')
+
+
+def test_send_command_success(manager, mock_server, wire_pane_lookup):
+    """Test successful command sending."""
+    # Pane lookup resolves to a pane id, then the keys go out
+    wire_pane_lookup(_reply())  # send-keys
+
+    result = manager.send_command(window_index=0, pane_index=0, command='echo test')
+
+    assert {'status': 'success', 'command': 'echo test'}.items() <= result.items()
+
+    # Verify the keys and Enter went out in a single tmux invocation
+    mock_server.cmd.assert_called_with(
+        'send-keys', '-t', '%0', '-l', 'echo test', ';', 'send-keys', '-t', '%0', 'Enter')
+
+
+def test_capture_pane_success(manager, mock_server, wire_pane_lookup):
+    """Test successful pane capture."""
+    # Pane lookup resolves to a pane id, then capture-pane returns lines
+    wire_pane_lookup(_reply(*_CAPTURE_LINES))
+
+    result = manager.capture_pane(window_index=0, pane_index=0)
+
+    assert {'status': 'success', 'lines': 3}.items() <= result.items()
+    assert 'content' in result
+
+    # Verify that capture-pane targeted the resolved pane and let tmux
+    # slice the scrollback tail
+    mock_server.cmd.assert_called_with('capture-pane', '-p', '-S', '-100', '-t', '%0')
+
+
+def test_capture_pane_lines_format(manager, mock_server, wire_pane_lookup):
+    """Test pane capture with the list-of-lines output format."""
+    wire_pane_lookup(_reply(*_CAPTURE_LINES))
+
+    result = manager.capture_pane(window_index=0, pane_index=0, output_format='lines')
+
+    expected = {'status': 'success', 'lines': 3, 'lines_data': list(_CAPTURE_LINES)}
+    assert expected.items() <= result.items()
+    assert 'content' not in result
+
+
+def test_list_sessions_success(manager, mock_server):
+    """Test successful session listing."""
+    # A plain attribute bag is all list_sessions reads from a session
+    session_obj = SimpleNamespace(session_id='@1', name='test-session',
+                                  session_attached='1', session_windows='2')
+    mock_server.sessions = [session_obj]
+
+    result = manager.list_sessions()
+
+    assert result['status'] == 'success'
+    assert len(result['sessions']) == 1
+    assert result['sessions'][0]['name'] == 'test-session'
+
+
+def test_list_windows_success(manager, mock_session, mock_window):
+    """Test successful window listing."""
+    # Mock the session's windows property; the prototype window
+    # already carries the name/active/panes attributes asserted below
+    mock_session.windows = [mock_window]
+
+    result = manager.list_windows()
+
+    assert result['status'] == 'success'
+    assert len(result['windows']) == 1
+    assert result['windows'][0]['name'] == 'test-window'
+    assert result['windows'][0]['panes'] == 2
+
+
+def test_list_panes_success(manager, mock_server):
+    """Test successful pane listing."""
+    # One formatted list-panes call covers the whole session
+    mock_server.cmd.side_effect = [
+        _reply('test-session\t$1'),  # list-sessions target resolution
+        _reply('0 0 %0 1 24 80',
+               '0 1 %1 0 24 80'),
+    ]
+
+    result = manager.list_panes(window_index=0)
+
+    assert result['status'] == 'success'
+    assert len(result['panes']) == 2
+    assert result['panes'][0]['id'] == '%0'
+    assert result['panes'][1]['active'] is False
+    mock_server.cmd.assert_called_with(
+        'list-panes', '-s', '-t', '$1',
+        '-F', '#{window_index} #{pane_index} #{pane_id} #{pane_active} #{pane_height} #{pane_width}')
 
 
 def test_json_output_format():
     """Test that output follows expected JSON format."""
-    # Test success structure
-    success_result = {"status": "success", "data": {"test": "value"}, "message": "Test message"}
-    json_output = json.dumps(success_result)
-    parsed = json.loads(json_output)
-    
-    assert parsed["status"] == "success"
-    assert "data" in parsed or "message" in parsed
-    
-    # Test error structure
-    error_result = {"status": "error", "message": "Something went wrong", "code": "TEST_ERROR"}
-    json_output = json.dumps(error_result)
-    parsed = json.loads(json_output)
-    
-    assert parsed["status"] == "error"
-    assert "message" in parsed
-    assert "code" in parsed
\ No newline at end of file
+    # Assert on the module-level shape constants directly; a loads()
+    # round trip would only re-prove what dumps() already guarantees
+    assert _SUCCESS["status"] == "success"
+    assert "data" in _SUCCESS or "message" in _SUCCESS
+
+    assert _ERROR["status"] == "error"
+    assert "message" in _ERROR
+    assert "code" in _ERROR
+
+    # One dumps() call per shape proves serializability
+    for result in (_SUCCESS, _ERROR):
+        try:
+            json.dumps(result)
+        except (TypeError, ValueError):
+            pytest.fail(f"result not JSON serializable: {result!r}")